@@ -29,18 +29,23 @@ def main():
     
     # Common inputs
     namespace = st.sidebar.text_input("Namespace*", help="Required for all operations")
+    execution_mode = st.sidebar.selectbox(
+        "Execution Mode",
+        ["auto", "eager", "chunked", "parallel"],
+        help="Auto picks in-memory, chunked or parallel processing from the workbook size"
+    )
     
     # Render the selected page
     if page == "Asset ID Generator":
-        render_asset_id_page()
+        render_asset_id_page(execution_mode)
     elif page == "Facility Processing":
-        render_facility_page(namespace)
+        render_facility_page(namespace, execution_mode)
     elif page == "Location Processing":
-        render_location_page(namespace)
+        render_location_page(namespace, execution_mode)
     elif page == "Space Processing":
-        render_space_page(namespace)
+        render_space_page(namespace, execution_mode)
     elif page == "Equipment Processing":
-        render_equipment_page(namespace)
+        render_equipment_page(namespace, execution_mode)
     elif page == "System Asset ID Mapping":
         render_system_asset_page()
 
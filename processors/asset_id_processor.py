@@ -1,6 +1,5 @@
 import os
 import sys
-import pandas as pd
 
 # Add the parent directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,46 +7,55 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from utils.error_handler import handle_error, logger
-from utils.helpers import get_short_form
+from utils.execution_planner import plan_execution, run_stage
+from utils.helpers import get_short_forms
+from utils.schema_probe import check_schema
+from utils.validation_constants import ASSET_ID_COLUMNS
+
+def check_required_columns(df):
+    """Raise if the DataFrame is missing any asset ID source column"""
+    missing_cols = [col for col in ASSET_ID_COLUMNS if col not in df.columns]
+
+    if missing_cols:
+        raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
 
 @handle_error
 def generate_asset_ids(df):
     """Generate asset IDs for the given DataFrame"""
-    required_cols = ["Building", "Location", "Space", "Subspace", 
-                    "Asset System", "Asset / Equipment"]
-    missing_cols = [col for col in required_cols if col not in df.columns]
-    
-    if missing_cols:
-        raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
-    
-    asset_counts = {}
-    df["Asset ID"] = df.apply(
-        lambda row: generate_single_asset_id(row, asset_counts), 
-        axis=1
-    )
-    
+    df = number_asset_ids(add_base_asset_ids(df))
+
     logger.info(f"Generated {len(df)} asset IDs")
     return df
 
-def generate_single_asset_id(row, asset_counts):
-    """Generate a single asset ID"""
-    components = [
-        get_short_form(row['Building']),
-        get_short_form(row['Location']),
-        get_short_form(row['Space']),
-        get_short_form(row['Subspace'])
-    ]
-    
-    eqp = ("UNK" if pd.isna(row['Asset / Equipment']) 
-           else get_short_form(row['Asset / Equipment']))
-    if eqp == "UNK" and not pd.isna(row['Asset System']):
-        eqp = get_short_form(row['Asset System'])
-    
-    components.append(eqp)
-    base_id = "-".join(components)
-    
-    if base_id not in asset_counts:
-        asset_counts[base_id] = 1
-    else:
-        asset_counts[base_id] += 1
-    return f"{base_id}-{asset_counts[base_id]}"
+@handle_error
+def process_asset_id_file(asset_file, sheet_name, execution_mode=None):
+    """Generate asset IDs for a sheet, choosing the execution path by size"""
+    check_schema(asset_file, {sheet_name: ASSET_ID_COLUMNS})
+    plan = plan_execution(asset_file, sheet_name, override=execution_mode)
+    df = number_asset_ids(run_stage(asset_file, sheet_name, add_base_asset_ids, plan))
+
+    logger.info(f"Generated {len(df)} asset IDs")
+    return df
+
+def add_base_asset_ids(df):
+    """Add the unnumbered asset ID of every row"""
+    check_required_columns(df)
+    # Equipment falls back to the asset system when it is missing
+    eqp = get_short_forms(df['Asset / Equipment'])
+    eqp = eqp.where((eqp != "UNK") | df['Asset System'].isna(), get_short_forms(df['Asset System']))
+    df["Asset ID"] = (
+        get_short_forms(df['Building']) + "-" +
+        get_short_forms(df['Location']) + "-" +
+        get_short_forms(df['Space']) + "-" +
+        get_short_forms(df['Subspace']) + "-" +
+        eqp
+    ).astype(object)
+    return df
+
+def number_asset_ids(df):
+    """Append the occurrence number of each base asset ID"""
+    # Numbering depends on earlier rows, so it runs once over the whole sheet
+    occurrence = df.groupby("Asset ID", sort=False).cumcount() + 1
+    # Both sides stay object dtype, so an empty sheet still concatenates
+    df["Asset ID"] = df["Asset ID"] + "-" + occurrence.astype(str).astype(object)
+    return df
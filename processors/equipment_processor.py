@@ -1,7 +1,7 @@
 import os
 import sys
+from functools import partial
 import pandas as pd
-from io import StringIO
 
 # Add the parent directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,70 +9,53 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from utils.error_handler import handle_error, logger
-from utils.validation_constants import EQUIPMENT_TYPES, EQUIPMENT_CLASSES
+from utils.execution_planner import plan_execution, run_stage, select_unique_rows
+from utils.schema_probe import check_schema
+from utils.template_registry import assemble_output, get_template_schema
+from utils.validation_constants import (
+    ASSET_LOCATION_SHEET, EQUIPMENT_COLUMNS, NORMALIZED_EQUIPMENT_TYPES, NORMALIZED_EQUIPMENT_CLASSES
+)
+from utils.validation_report import ValidationReport, find_non_standard_values
 
-def validate_equipment_data(df, source_data):
+def validate_equipment_data(source_data):
     """Validate equipment types and classes in the dataframe"""
-    warnings = []
+    # Check equipment class (Asset System) and type (Asset / Equipment)
+    issues = pd.concat([
+        find_non_standard_values(
+            source_data['Asset System'], NORMALIZED_EQUIPMENT_CLASSES, "Equipment class", "Asset System"
+        ),
+        find_non_standard_values(
+            source_data['Asset / Equipment'], NORMALIZED_EQUIPMENT_TYPES, "Equipment type", "Asset / Equipment"
+        ),
+    ], ignore_index=True)
     
-    # Convert sets to case-insensitive for comparison
-    valid_types = {t.lower().strip() for t in EQUIPMENT_TYPES}
-    valid_classes = {c.lower().strip() for c in EQUIPMENT_CLASSES}
-    
-    # Track unique non-standard values for summary
-    non_standard_classes = set()
-    non_standard_types = set()
-    
-    # Check equipment class (Asset System)
-    for idx, row in source_data.iterrows():
-        asset_system = row['Asset System']
-        if pd.notna(asset_system) and asset_system != 'Mandatory':
-            if asset_system.lower().strip() not in valid_classes:
-                warnings.append(f"Row {idx + 2}: Non-standard equipment class '{asset_system}' in Asset System column")
-                non_standard_classes.add(asset_system)
-    
-    # Check equipment type (Asset / Equipment)
-    for idx, row in source_data.iterrows():
-        asset_equipment = row['Asset / Equipment']
-        if pd.notna(asset_equipment) and asset_equipment != 'Mandatory':
-            if asset_equipment.lower().strip() not in valid_types:
-                warnings.append(f"Row {idx + 2}: Non-standard equipment type '{asset_equipment}' in Asset/Equipment column")
-                non_standard_types.add(asset_equipment)
-    
-    if warnings:
-        # Add summary of unique non-standard values
-        summary = []
-        if non_standard_classes:
-            summary.extend([
-                "\nNon-standard Equipment Classes found:",
-                "================================",
-                *[f"- {cls}" for cls in sorted(non_standard_classes)]
-            ])
-        if non_standard_types:
-            summary.extend([
-                "\nNon-standard Equipment Types found:",
-                "================================",
-                *[f"- {typ}" for typ in sorted(non_standard_types)]
-            ])
-        warnings.extend(summary)
-        
-        warnings.append("\nNote: You can proceed with the upload, but make sure to create these equipment classes/types in your system.")
-    
-    return warnings
+    return ValidationReport(
+        issues,
+        title="Equipment Validation Warnings:",
+        headings={
+            "Equipment class": "Non-standard Equipment Classes found:",
+            "Equipment type": "Non-standard Equipment Types found:",
+        },
+        note="Note: You can proceed with the upload, but make sure to create these equipment classes/types in your system.",
+    )
 
 @handle_error
-def process_equipment_data(asset_location_file, equipment_template, namespace):
+def process_equipment_data(asset_location_file, equipment_template, namespace, execution_mode=None):
     """Process equipment data"""
     logger.info("Starting equipment data processing")
     
+    # Fail fast on missing sheets or columns before the full load
+    check_schema(asset_location_file, {ASSET_LOCATION_SHEET: EQUIPMENT_COLUMNS})
+    
     # Load data
-    asset_location_data = pd.read_excel(asset_location_file, sheet_name='Asset,location')
-    template_data = pd.read_csv(equipment_template)
+    plan = plan_execution(asset_location_file, ASSET_LOCATION_SHEET, override=execution_mode)
+    template_schema = get_template_schema(equipment_template)
     
     # Extract unique equipment data
-    unique_data = asset_location_data[
-        ['Barcode', 'Asset System', 'Asset / Equipment', 'Asset Criticality', 'Sublocation']
-    ].drop_duplicates()
+    unique_data = run_stage(
+        asset_location_file, ASSET_LOCATION_SHEET,
+        partial(select_unique_rows, columns=EQUIPMENT_COLUMNS), plan
+    ).drop_duplicates()
     
     # Filter valid data
     valid_data = unique_data[
@@ -82,41 +65,30 @@ def process_equipment_data(asset_location_file, equipment_template, namespace):
     ]
     
     # Check for non-standard equipment data
-    validation_warnings = validate_equipment_data(template_data, valid_data)
+    validation_report = validate_equipment_data(valid_data)
     
-    # Create new equipment data
-    new_equipment_data = pd.DataFrame({
-        'barcode': valid_data['Barcode'].reset_index(drop=True),
-        'name*': valid_data.apply(
-            lambda x: x['Asset / Equipment'] if pd.notna(x['Asset / Equipment']) else x['Asset System'],
-            axis=1
-        ).reset_index(drop=True),
-        'type': valid_data['Asset / Equipment'].reset_index(drop=True),  # Equipment Type
-        'class': valid_data['Asset System'].reset_index(drop=True),      # Equipment Class
-        'criticality': valid_data['Asset Criticality'].reset_index(drop=True),
-        'space name': valid_data['Sublocation'].reset_index(drop=True),
+    # Assemble in template layout
+    updated_equipment_data = assemble_output(template_schema, {
+        'barcode': valid_data['Barcode'],
+        'name*': valid_data['Asset / Equipment'].where(
+            valid_data['Asset / Equipment'].notna(), valid_data['Asset System']
+        ),
+        'type': valid_data['Asset / Equipment'],  # Equipment Type
+        'class': valid_data['Asset System'],      # Equipment Class
+        'criticality': valid_data['Asset Criticality'],
+        'space name': valid_data['Sublocation'],
         'namespace*': namespace,
         'isActive*': True
-    })
-    
-    # Merge with template
-    template_data_cleaned = template_data.iloc[1:]
-    updated_equipment_data = pd.concat([template_data_cleaned, new_equipment_data], ignore_index=True)
+    }, len(valid_data))
     
-    # If there are warnings, create a warning log
-    warning_file = None
-    if validation_warnings:
-        warning_log = "\n".join([
-            "Equipment Validation Warnings:",
-            "==========================",
-            *validation_warnings
-        ])
-        
-        warning_file = StringIO()
-        warning_file.write(warning_log)
-        warning_file.seek(0)
-        
-        logger.warning(f"Found {len(validation_warnings)} non-standard equipment types/classes")
+    # Only hand back a report when something needs attention
+    if len(validation_report):
+        logger.warning(
+            f"Found {len(validation_report)} non-standard equipment types/classes "
+            f"across {validation_report.total_rows} rows"
+        )
+    else:
+        validation_report = None
     
-    logger.info(f"Processed {len(new_equipment_data)} equipment records successfully")
-    return updated_equipment_data, warning_file
+    logger.info(f"Processed {len(valid_data)} equipment records successfully")
+    return updated_equipment_data, validation_report
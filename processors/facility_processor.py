@@ -1,5 +1,6 @@
 import os
 import sys
+from functools import partial
 import pandas as pd
 
 # Add the parent directory to Python path
@@ -8,57 +9,71 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from utils.error_handler import handle_error, logger
+from utils.execution_planner import plan_execution, run_stage
+from utils.schema_probe import check_schema
+from utils.template_registry import assemble_output, get_template_schema
+from utils.validation_constants import FACILITY_SHEET, FACILITY_COLUMNS
 
-@handle_error
-def process_facility_data(facility_file, template_file, namespace):
-    """Process facility data"""
-    logger.info("Starting facility data processing")
-    
-    # Load the AFM file and the facility template
-    afm_data = pd.read_excel(facility_file, sheet_name='Building (Facility)')
-    facility_template_data = pd.read_csv(template_file)
-    
-    # Define the required column mappings
-    required_columns = {
-        "name*": "Building Name",
-        "facilityType*": "Facility Type",
-        "criticality": "Building Criticality",
-        "location.longitude": "Longitude",
-        "location.latitude": "Latitude",
-    }
-    
+# Define the required column mappings
+REQUIRED_COLUMNS = {
+    "name*": "Building Name",
+    "facilityType*": "Facility Type",
+    "criticality": "Building Criticality",
+    "location.longitude": "Longitude",
+    "location.latitude": "Latitude",
+}
+
+def extract_facility_rows(afm_data, namespace):
+    """Extract cleaned facility rows from a block of AFM data"""
     # Validate required columns
-    missing_cols = [col for col, mapped_col in required_columns.items() 
+    missing_cols = [col for col, mapped_col in REQUIRED_COLUMNS.items() 
                    if mapped_col not in afm_data.columns]
     if missing_cols:
         raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
     
     # Normalize the criticality values
-    afm_data["Building Criticality"] = afm_data["Building Criticality"].str.extract(r"(C\d)")
+    criticality = afm_data["Building Criticality"].astype("string").str.extract(r"(C\d)")[0]
     
     # Prepare the new data
     facility_data = pd.DataFrame({
-        "name*": afm_data[required_columns["name*"]],
-        "facilityType*": afm_data[required_columns["facilityType*"]],
-        "criticality": afm_data[required_columns["criticality"]],
-        "location.longitude": pd.to_numeric(afm_data[required_columns["location.longitude"]], errors='coerce'),
-        "location.latitude": pd.to_numeric(afm_data[required_columns["location.latitude"]], errors='coerce'),
+        "name*": afm_data[REQUIRED_COLUMNS["name*"]],
+        "facilityType*": afm_data[REQUIRED_COLUMNS["facilityType*"]],
+        "criticality": criticality,
+        "location.longitude": pd.to_numeric(afm_data[REQUIRED_COLUMNS["location.longitude"]], errors='coerce'),
+        "location.latitude": pd.to_numeric(afm_data[REQUIRED_COLUMNS["location.latitude"]], errors='coerce'),
         "isActive*": True,
         "namespace*": namespace,
     })
     
     # Clean and filter data
     valid_criticality_values = ["C1", "C2", "C3"]
-    cleaned_facility_data = facility_data[
+    return facility_data[
         (facility_data["name*"].notna()) &
         (~facility_data["name*"].str.contains("Mandatory|name", case=False, na=False)) &
         (~facility_data["facilityType*"].str.contains("Mandatory|facility type", case=False, na=False)) &
         (facility_data["criticality"].isin(valid_criticality_values))
     ]
+
+@handle_error
+def process_facility_data(facility_file, template_file, namespace, execution_mode=None):
+    """Process facility data"""
+    logger.info("Starting facility data processing")
+    
+    # Fail fast on missing sheets or columns before the full load
+    check_schema(facility_file, {FACILITY_SHEET: FACILITY_COLUMNS})
+    
+    # Load the facility template and process the AFM file as planned
+    template_schema = get_template_schema(template_file)
+    plan = plan_execution(facility_file, FACILITY_SHEET, override=execution_mode)
+    cleaned_facility_data = run_stage(
+        facility_file, FACILITY_SHEET,
+        partial(extract_facility_rows, namespace=namespace), plan
+    )
     
-    # Remove placeholder rows and merge
-    facility_template_data = facility_template_data.drop(index=[0, 1], errors='ignore').reset_index(drop=True)
-    updated_facility_data = pd.concat([facility_template_data, cleaned_facility_data], ignore_index=True)
+    # Assemble in template layout
+    updated_facility_data = assemble_output(
+        template_schema, dict(cleaned_facility_data.items()), len(cleaned_facility_data)
+    )
     
     logger.info(f"Processed {len(cleaned_facility_data)} facility records")
     return updated_facility_data
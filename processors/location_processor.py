@@ -1,6 +1,6 @@
 import os
 import sys
-import pandas as pd
+from functools import partial
 
 # Add the parent directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,18 +8,28 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from utils.error_handler import handle_error, logger
+from utils.execution_planner import plan_execution, run_stage, select_unique_rows
+from utils.schema_probe import check_schema
+from utils.template_registry import assemble_output, get_template_schema
+from utils.validation_constants import ASSET_LOCATION_SHEET, LOCATION_COLUMNS
 
 @handle_error
-def process_location_data(asset_location_file, location_template, namespace):
+def process_location_data(asset_location_file, location_template, namespace, execution_mode=None):
     """Process location data"""
     logger.info("Starting location data processing")
     
+    # Fail fast on missing sheets or columns before the full load
+    check_schema(asset_location_file, {ASSET_LOCATION_SHEET: LOCATION_COLUMNS})
+    
     # Load files
-    asset_location_data = pd.read_excel(asset_location_file, sheet_name='Asset,location')
-    template_data = pd.read_csv(location_template)
+    plan = plan_execution(asset_location_file, ASSET_LOCATION_SHEET, override=execution_mode)
+    template_schema = get_template_schema(location_template)
     
     # Extract and clean building/floor data
-    unique_building_floor = asset_location_data[['Building', 'Floor']].drop_duplicates().dropna()
+    unique_building_floor = run_stage(
+        asset_location_file, ASSET_LOCATION_SHEET,
+        partial(select_unique_rows, columns=LOCATION_COLUMNS), plan
+    ).drop_duplicates().dropna()
     valid_data = unique_building_floor[
         (unique_building_floor['Building'] != 'Mandatory') & 
         (unique_building_floor['Building'].notna()) & 
@@ -27,18 +37,14 @@ def process_location_data(asset_location_file, location_template, namespace):
         (unique_building_floor['Floor'].notna())
     ]
     
-    # Create new location data
-    new_location_data = pd.DataFrame({
-        'facility*': [None] * len(valid_data),
-        'facility name': valid_data['Building'].reset_index(drop=True),
-        'name*': valid_data['Floor'].reset_index(drop=True),
+    # Assemble in template layout
+    updated_location_data = assemble_output(template_schema, {
+        'facility*': None,
+        'facility name': valid_data['Building'],
+        'name*': valid_data['Floor'],
         'namespace*': namespace,
         'isActive*': True
-    })
-    
-    # Merge with template
-    template_data_cleaned = template_data.iloc[1:]
-    updated_location_data = pd.concat([template_data_cleaned, new_location_data], ignore_index=True)
+    }, len(valid_data))
     
-    logger.info(f"Processed {len(new_location_data)} location records")
+    logger.info(f"Processed {len(valid_data)} location records")
     return updated_location_data
@@ -1,6 +1,6 @@
 import os
 import sys
-import pandas as pd
+from functools import partial
 
 # Add the parent directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,18 +8,28 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from utils.error_handler import handle_error, logger
+from utils.execution_planner import plan_execution, run_stage, select_unique_rows
+from utils.schema_probe import check_schema
+from utils.template_registry import assemble_output, get_template_schema
+from utils.validation_constants import ASSET_LOCATION_SHEET, SPACE_COLUMNS
 
 @handle_error
-def process_space_data(asset_location_file, space_template, namespace):
+def process_space_data(asset_location_file, space_template, namespace, execution_mode=None):
     """Process space data"""
     logger.info("Starting space data processing")
     
+    # Fail fast on missing sheets or columns before the full load
+    check_schema(asset_location_file, {ASSET_LOCATION_SHEET: SPACE_COLUMNS})
+    
     # Load data
-    asset_location_data = pd.read_excel(asset_location_file, sheet_name='Asset,location')
-    template_data = pd.read_csv(space_template)
+    plan = plan_execution(asset_location_file, ASSET_LOCATION_SHEET, override=execution_mode)
+    template_schema = get_template_schema(space_template)
     
     # Extract unique data
-    unique_data = asset_location_data[['Building', 'Floor', 'Sublocation']].drop_duplicates().dropna()
+    unique_data = run_stage(
+        asset_location_file, ASSET_LOCATION_SHEET,
+        partial(select_unique_rows, columns=SPACE_COLUMNS), plan
+    ).drop_duplicates().dropna()
     valid_data = unique_data[
         (unique_data['Building'] != 'Mandatory') &
         (unique_data['Building'].notna()) &
@@ -29,18 +39,14 @@ def process_space_data(asset_location_file, space_template, namespace):
         (unique_data['Sublocation'].notna())
     ]
     
-    # Create new space data
-    new_space_data = pd.DataFrame({
-        'facility name': valid_data['Building'].reset_index(drop=True),
-        'location name': valid_data['Floor'].reset_index(drop=True),
-        'name*': valid_data['Sublocation'].reset_index(drop=True),
+    # Assemble in template layout
+    updated_space_data = assemble_output(template_schema, {
+        'facility name': valid_data['Building'],
+        'location name': valid_data['Floor'],
+        'name*': valid_data['Sublocation'],
         'namespace*': namespace,
         'isActive*': True
-    })
-    
-    # Merge with template
-    template_data_cleaned = template_data.iloc[1:]
-    updated_space_data = pd.concat([template_data_cleaned, new_space_data], ignore_index=True)
+    }, len(valid_data))
     
-    logger.info(f"Processed {len(new_space_data)} space records")
+    logger.info(f"Processed {len(valid_data)} space records")
     return updated_space_data
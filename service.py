@@ -0,0 +1,312 @@
+"""Local HTTP onboarding service backed by warm worker processes
+
+Run with ``python service.py`` and submit jobs as JSON:
+
+    POST /jobs/<processor>
+    {"namespace": "...", "files": {"workbook": "<base64 xlsx>"}}
+
+``POST /probe`` with the same body checks the workbook headers against every
+processor in milliseconds. ``GET /health`` reports capacity and ``GET /metrics`` reports job counters
+and the most recent per-job metrics.
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the current directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from utils.error_handler import logger
+from utils.execution_planner import CHUNKED, PARALLEL, resolve_execution_mode
+from utils.helpers import get_template_path
+from utils.schema_probe import probe_workbook
+from utils.validation_constants import PROCESSOR_SCHEMAS
+
+# Processor name -> (module, function, template file, input files)
+PROCESSORS = {
+    "asset_ids": ("processors.asset_id_processor", "process_asset_id_file", None, ["workbook"]),
+    "facility": ("processors.facility_processor", "process_facility_data", "facility_template.csv", ["workbook"]),
+    "location": ("processors.location_processor", "process_location_data", "location_template.csv", ["workbook"]),
+    "space": ("processors.space_processor", "process_space_data", "space_template.csv", ["workbook"]),
+    "equipment": ("processors.equipment_processor", "process_equipment_data", "equipment_template.csv", ["workbook"]),
+    "system_asset": ("processors.system_asset_processor", "process_system_asset_mapping", None, ["location_file", "space_file"]),
+}
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_JOB_TIMEOUT = 600
+RECENT_JOBS = 100
+
+# Worker process state, filled in by _warm_worker
+_PROCESSOR_FUNCS = {}
+
+
+def _warm_worker():
+    """Import every processor in a worker process
+
+    Importing the processors also parses every template into the template
+    registry, so jobs never read a template from disk.
+    """
+    import importlib
+
+    for name, (module_name, func_name, _, _) in PROCESSORS.items():
+        func = getattr(importlib.import_module(module_name), func_name)
+        # Call past handle_error so failures reach the client
+        _PROCESSOR_FUNCS[name] = getattr(func, "__wrapped__", func)
+
+
+def _ping():
+    return os.getpid()
+
+
+def run_job(processor, files, options):
+    """Run one processor job inside a warm worker"""
+    started = time.time()
+    func = _PROCESSOR_FUNCS[processor]
+    inputs = [io.BytesIO(files[key]) for key in PROCESSORS[processor][3]]
+    execution_mode = options.get("execution_mode")
+    # Workers already run jobs side by side, so a job never starts its own pool
+    if resolve_execution_mode(execution_mode) == PARALLEL:
+        execution_mode = CHUNKED
+
+    if processor == "asset_ids":
+        result = func(inputs[0], options.get("sheet_name", "Asset,location"), execution_mode)
+    elif processor == "system_asset":
+        result = func(*inputs)
+    else:
+        template_path = get_template_path(PROCESSORS[processor][2])
+        result = func(inputs[0], template_path, options["namespace"], execution_mode)
+
+    warnings = validation_report = None
+    if isinstance(result, tuple):
+        result, report = result
+        if report:
+            warnings = report.to_text(detailed=options.get("detailed_warnings", False))
+            validation_report = json.loads(report.to_json())
+
+    return {
+        "csv": result.to_csv(index=False),
+        "rows": len(result),
+        "warnings": warnings,
+        "validation_report": validation_report,
+        "worker_pid": os.getpid(),
+        "started_at": started,
+        "run_ms": round((time.time() - started) * 1000, 1),
+    }
+
+
+class OnboardingService:
+    """Warm worker pool with a bounded job queue and per-job metrics"""
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE, job_timeout=DEFAULT_JOB_TIMEOUT):
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + queue_size
+        self.job_timeout = job_timeout
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._in_flight = 0
+        self._counters = {"submitted": 0, "succeeded": 0, "failed": 0, "rejected": 0}
+        self._recent = deque(maxlen=RECENT_JOBS)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+
+    def warm_up(self):
+        """Start every worker before the first job arrives"""
+        futures = [self._executor.submit(_ping) for _ in range(self.workers)]
+        pids = {future.result() for future in futures}
+        logger.info(f"Warmed {len(pids)} worker processes")
+
+    def _restart_pool(self, broken):
+        with self._pool_lock:
+            if self._executor is not broken:
+                return
+            logger.warning("Worker pool broken, starting a new one")
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        # Cancelling queued jobs runs their callbacks, which take self._lock
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _release_slot(self, future):
+        """Free a job slot once its job has really finished or been cancelled"""
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
+
+    def submit(self, processor, files, options):
+        """Run a job and return (status code, response payload)"""
+        if processor not in PROCESSORS:
+            return 404, {"error": f"Unknown processor '{processor}'", "processors": sorted(PROCESSORS)}
+        missing = [key for key in PROCESSORS[processor][3] if key not in files]
+        if missing:
+            return 400, {"error": f"Missing files: {', '.join(missing)}"}
+        if PROCESSORS[processor][2] and not options.get("namespace"):
+            return 400, {"error": "Namespace is required"}
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters["rejected"] += 1
+            return 503, {"error": "Job queue is full, retry later"}
+
+        job_id = uuid.uuid4().hex[:12]
+        submitted = time.time()
+        metrics = {
+            "job_id": job_id,
+            "processor": processor,
+            "input_bytes": sum(len(content) for content in files.values()),
+        }
+        with self._lock:
+            self._in_flight += 1
+            self._counters["submitted"] += 1
+        executor = self._executor
+        try:
+            future = executor.submit(run_job, processor, files, options)
+        except BrokenProcessPool:
+            self._release_slot(None)
+            self._restart_pool(executor)
+            return self._finish(metrics, submitted, 500, {"error": "Worker process died, pool restarted"})
+        # A timed-out job keeps its worker busy, so its slot is only freed when it ends
+        future.add_done_callback(self._release_slot)
+
+        try:
+            result = future.result(timeout=self.job_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            return self._finish(metrics, submitted, 504, {"error": "Job timed out"})
+        except BrokenProcessPool:
+            self._restart_pool(executor)
+            return self._finish(metrics, submitted, 500, {"error": "Worker process died, pool restarted"})
+        except Exception as e:
+            return self._finish(metrics, submitted, 422, {"error": str(e)})
+
+        metrics.update(
+            queue_ms=round((result.pop("started_at") - submitted) * 1000, 1),
+            run_ms=result.pop("run_ms"),
+            output_rows=result["rows"],
+            worker_pid=result.pop("worker_pid"),
+        )
+        return self._finish(metrics, submitted, 200, result)
+
+    def probe(self, files, processors=None):
+        """Check workbook headers for every processor, within the job slots"""
+        if "workbook" not in files:
+            return 400, {"error": "Missing files: workbook"}
+        unknown = [name for name in processors or [] if name not in PROCESSOR_SCHEMAS]
+        if unknown:
+            return 400, {"error": f"Unknown processors: {', '.join(unknown)}"}
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters["rejected"] += 1
+            return 503, {"error": "Job queue is full, retry later"}
+        try:
+            problems = probe_workbook(io.BytesIO(files["workbook"]), processors)
+        finally:
+            self._slots.release()
+        return 200, {"ok": not any(problems.values()), "problems": problems}
+
+    def _finish(self, metrics, submitted, status, payload):
+        metrics["status"] = status
+        metrics["total_ms"] = round((time.time() - submitted) * 1000, 1)
+        with self._lock:
+            self._counters["succeeded" if status == 200 else "failed"] += 1
+            self._recent.append(metrics)
+        logger.info(f"Job {metrics['job_id']} ({metrics['processor']}) finished: {metrics}")
+        return status, {**payload, "job_id": metrics["job_id"], "metrics": metrics}
+
+    def health(self):
+        with self._lock:
+            return {
+                "status": "ok",
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+            }
+
+    def metrics(self):
+        with self._lock:
+            return {**self._counters, "in_flight": self._in_flight, "recent": list(self._recent)}
+
+
+class OnboardingRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, self.service.health())
+        elif self.path == "/metrics":
+            self._send_json(200, self.service.metrics())
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        if parts != ["probe"] and (len(parts) != 2 or parts[0] != "jobs"):
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            files = {key: base64.b64decode(value) for key, value in request.pop("files", {}).items()}
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send_json(400, {"error": f"Invalid request body: {str(e)}"})
+            return
+
+        if parts == ["probe"]:
+            self._send_json(*self.service.probe(files, request.get("processors")))
+        else:
+            self._send_json(*self.service.submit(parts[1], files, request))
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Facilitrol-X onboarding service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Jobs allowed to wait for a worker before new ones are rejected")
+    parser.add_argument("--job-timeout", type=float, default=DEFAULT_JOB_TIMEOUT)
+    args = parser.parse_args()
+
+    service = OnboardingService(args.workers, args.queue_size, args.job_timeout)
+    service.warm_up()
+    OnboardingRequestHandler.service = service
+    server = ThreadingHTTPServer((args.host, args.port), OnboardingRequestHandler)
+    logger.info(f"Onboarding service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the parent directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from processors.asset_id_processor import generate_asset_ids, process_asset_id_file
+from utils.validation_constants import ASSET_ID_COLUMNS
+
+
+def test_generate_asset_ids():
+    df = pd.DataFrame({
+        "Building": ["Tower", "Tower", "Tower"],
+        "Location": ["L1", "L1", None],
+        "Space": ["Lobby", "Lobby", "Roof"],
+        "Subspace": [None, None, " "],
+        "Asset System": ["HVAC", "HVAC", "Plumbing"],
+        "Asset / Equipment": ["Chiller", "Chiller", None],
+    })
+    assert generate_asset_ids(df)["Asset ID"].tolist() == [
+        "TOW-L1-LOB-UNK-CHI-1",
+        "TOW-L1-LOB-UNK-CHI-2",
+        "TOW-UNK-ROO-UNK-PLU-1",
+    ]
+
+
+def test_generate_asset_ids_empty_frame():
+    df = pd.DataFrame({col: pd.Series(dtype=object) for col in ASSET_ID_COLUMNS})
+    result = generate_asset_ids(df)
+    assert result is not None
+    assert "Asset ID" in result.columns
+    assert result.empty
+
+
+@pytest.mark.parametrize("mode", ["eager", "chunked", "parallel"])
+def test_process_asset_id_file_header_only_sheet(tmp_path, mode):
+    path = tmp_path / "header_only.xlsx"
+    pd.DataFrame(columns=ASSET_ID_COLUMNS).to_excel(path, sheet_name="Asset,location", index=False)
+    result = process_asset_id_file(str(path), "Asset,location", mode)
+    assert result is not None
+    assert list(result.columns) == [*ASSET_ID_COLUMNS, "Asset ID"]
+    assert result.empty
@@ -0,0 +1,124 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the parent directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import utils.execution_planner as execution_planner
+from processors.asset_id_processor import process_asset_id_file
+from processors.equipment_processor import process_equipment_data
+from processors.facility_processor import process_facility_data
+from processors.location_processor import process_location_data
+from processors.space_processor import process_space_data
+from utils.helpers import get_template_path
+
+MODES = ["eager", "chunked", "parallel"]
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    """Small workbook with NA strings and blanks, split into several chunks"""
+    monkeypatch.setattr(execution_planner, "DEFAULT_CHUNK_SIZE", 2)
+    asset_location = pd.DataFrame({
+        "Barcode": ["B-1", "B-2", "B-3", "B-4", "B-5"],
+        "Building": ["B1", "B1", "NA", "B2", "B2"],
+        "Floor": ["G", 1, None, 2, "N/A"],
+        "Sublocation": ["Room A", "Room B", "Room C", "n/a", "Room D"],
+        "Location": [3, 3, None, 4, 4],
+        "Space": ["X", "X", "X", "X", "X"],
+        "Subspace": [None, "N/A", None, None, None],
+        "Asset System": ["HVAC", "NA", "Plumbing", "Odd system", "HVAC"],
+        "Asset / Equipment": ["CCTV", "n/a", "N/A", "Odd type", "CCTV"],
+        "Asset Criticality": ["C1", "C2", "NA", "C1", "C1"],
+    })
+    facility = pd.DataFrame({
+        "Building Name": ["Tower A", "NA", "Tower B"],
+        "Facility Type": ["Office", "Mall", "N/A"],
+        "Building Criticality": ["C1", "C2", "C3"],
+        "Longitude": ["55.2", "NA", "55.3"],
+        "Latitude": [25, 26, None],
+    })
+    path = tmp_path / "workbook.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        asset_location.to_excel(writer, sheet_name="Asset,location", index=False)
+        facility.to_excel(writer, sheet_name="Building (Facility)", index=False)
+    return str(path)
+
+
+def _run_all(workbook, mode):
+    equipment, report = process_equipment_data(
+        workbook, get_template_path("equipment_template.csv"), "ns", mode
+    )
+    return {
+        "facility": process_facility_data(
+            workbook, get_template_path("facility_template.csv"), "ns", mode
+        ).to_csv(index=False),
+        "location": process_location_data(
+            workbook, get_template_path("location_template.csv"), "ns", mode
+        ).to_csv(index=False),
+        "space": process_space_data(
+            workbook, get_template_path("space_template.csv"), "ns", mode
+        ).to_csv(index=False),
+        "equipment": equipment.to_csv(index=False),
+        "equipment_report": report.to_json(detailed=True),
+        "asset_ids": process_asset_id_file(workbook, "Asset,location", mode).to_csv(index=False),
+    }
+
+
+@pytest.mark.parametrize("mode", ["chunked", "parallel"])
+def test_modes_match_eager(workbook, mode):
+    assert _run_all(workbook, mode) == _run_all(workbook, "eager")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_chunks_match_read_excel(tmp_path, chunk_size):
+    sheet = pd.DataFrame({
+        "ints": [1, 2, 3, 4],
+        "ints_blank": [3, None, 4, 5],
+        "mixed": ["G", 1, None, 2],
+        "number_strings": ["55.2", "NA", "55.3", "1"],
+        "mixed_strings": ["55.2", None, "x", "1"],
+        "bools": [True, False, None, True],
+        "bool_strings": ["TRUE", "FALSE", "true", "False"],
+        "dates": [pd.Timestamp("2024-01-01"), None, pd.Timestamp("2024-02-01"), None],
+        "blank": [None, None, None, None],
+    })
+    path = tmp_path / "types.xlsx"
+    sheet.to_excel(path, sheet_name="Sheet", index=False)
+    chunks = execution_planner.iter_sheet_chunks(str(path), "Sheet", chunk_size)
+    pd.testing.assert_frame_equal(pd.concat(chunks), pd.read_excel(path, sheet_name="Sheet"))
+
+
+def test_na_strings_read_as_missing(workbook):
+    chunks = list(execution_planner.iter_sheet_chunks(workbook, "Asset,location", 2))
+    assert len(chunks) == 3
+    sheet = pd.concat(chunks)
+    assert sheet["Building"].isna().tolist() == [False, False, True, False, False]
+    assert sheet["Asset / Equipment"].isna().tolist() == [False, True, True, False, False]
+
+
+@pytest.mark.parametrize("override, env, expected", [
+    (None, None, None),
+    ("auto", None, None),
+    ("AUTO", None, None),
+    (" Chunked ", None, "chunked"),
+    ("auto", "chunked", "chunked"),
+    (None, "Parallel", "parallel"),
+    ("eager", "chunked", "eager"),
+])
+def test_resolve_execution_mode(monkeypatch, override, env, expected):
+    if env is None:
+        monkeypatch.delenv(execution_planner.EXECUTION_MODE_ENV, raising=False)
+    else:
+        monkeypatch.setenv(execution_planner.EXECUTION_MODE_ENV, env)
+    assert execution_planner.resolve_execution_mode(override) == expected
+
+
+def test_resolve_execution_mode_rejects_unknown():
+    with pytest.raises(ValueError):
+        execution_planner.resolve_execution_mode("fast")
@@ -0,0 +1,38 @@
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the parent directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from utils.helpers import get_short_form, get_short_forms
+
+VALUES = [
+    "Building A", "ab", " hvac ", "", "   ", "ß-room", None, np.nan, pd.NaT,
+    7, 12.5, 3.0, 1024, True, datetime(2024, 1, 31), pd.Timestamp("2023-05-06 07:08"),
+]
+
+
+@pytest.mark.parametrize("dtype", [object, None])
+def test_get_short_forms_matches_get_short_form(dtype):
+    values = pd.Series(VALUES, dtype=dtype)
+    expected = [get_short_form(value) for value in values]
+    assert get_short_forms(values).tolist() == expected
+
+
+@pytest.mark.parametrize("values", [
+    pd.Series([1.0, np.nan, 250.0]),
+    pd.Series([1, 22, 333]),
+    pd.Series([" a ", None, "Lobby"], dtype="string"),
+    pd.Series(pd.to_datetime(["2024-01-31", None])),
+    pd.Series([], dtype=object),
+])
+def test_get_short_forms_matches_typed_columns(values):
+    expected = [get_short_form(value) for value in values]
+    assert get_short_forms(values).tolist() == expected
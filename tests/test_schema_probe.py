@@ -0,0 +1,83 @@
+import os
+import pickle
+import sys
+import zipfile
+
+import pandas as pd
+import pytest
+
+# Add the parent directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from utils.schema_probe import SchemaError, check_schema, probe_workbook
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Workbook with a header typo and no facility sheet"""
+    path = tmp_path / "workbook.xlsx"
+    sheet = pd.DataFrame({"Building": ["B1"], "Floor": ["F1"], "Sub location": ["Room A"]})
+    with pd.ExcelWriter(path) as writer:
+        sheet.to_excel(writer, sheet_name="Asset,location", index=False)
+    return str(path)
+
+
+def test_probe_workbook_reports_every_processor(workbook):
+    problems = probe_workbook(workbook, ["facility", "location", "space"])
+    assert problems["location"] == []
+    assert problems["facility"] == ["Missing sheet 'Building (Facility)' (found: Asset,location)"]
+    assert problems["space"] == [
+        "Sheet 'Asset,location' is missing column 'Sublocation' (did you mean 'Sub location'?)"
+    ]
+
+
+def test_schema_error_survives_pickling(workbook):
+    with pytest.raises(SchemaError) as excinfo:
+        check_schema(workbook, {"Asset,location": ["Sublocation", "Barcode"]})
+
+    restored = pickle.loads(pickle.dumps(excinfo.value))
+    assert restored.problems == excinfo.value.problems
+    assert str(restored) == str(excinfo.value)
+    assert str(restored).splitlines()[1:] == [
+        "- Sheet 'Asset,location' is missing column 'Sublocation' (did you mean 'Sub location'?)",
+        "- Sheet 'Asset,location' is missing column 'Barcode'",
+    ]
+
+
+def _rewrite_workbook(source, target, rewrite):
+    """Copy an xlsx package, letting rewrite(name, data) rename or change parts"""
+    with zipfile.ZipFile(source) as original, zipfile.ZipFile(target, "w") as copy:
+        for item in original.infolist():
+            name, data = rewrite(item.filename, original.read(item.filename))
+            copy.writestr(name, data)
+
+
+def test_probe_workbook_reports_malformed_parts(workbook, tmp_path):
+    broken = tmp_path / "broken.xlsx"
+    _rewrite_workbook(workbook, broken, lambda name, data: (
+        name, data[: len(data) // 2] if name.startswith("xl/worksheets/") else data
+    ))
+
+    problems = probe_workbook(str(broken), ["location", "space"])
+    assert set(problems) == {"location", "space"}
+    for processor_problems in problems.values():
+        assert len(processor_problems) == 1
+        assert processor_problems[0].startswith("File is not a readable .xlsx workbook")
+
+
+def test_probe_workbook_finds_workbook_part_through_relationships(workbook, tmp_path):
+    moved = tmp_path / "moved.xlsx"
+    renames = {"xl/workbook.xml": "xl/main.xml", "xl/_rels/workbook.xml.rels": "xl/_rels/main.xml.rels"}
+
+    def rewrite(name, data):
+        if name in ("_rels/.rels", "[Content_Types].xml"):
+            data = data.replace(b"xl/workbook.xml", b"xl/main.xml")
+        return renames.get(name, name), data
+
+    _rewrite_workbook(workbook, moved, rewrite)
+    # pandas only sniffs xl/workbook.xml, so the engine is named; openpyxl follows the package
+    sheet = pd.read_excel(moved, sheet_name="Asset,location", engine="openpyxl")
+    assert list(sheet.columns) == ["Building", "Floor", "Sub location"]
+    assert probe_workbook(str(moved), ["location"]) == {"location": []}
@@ -0,0 +1,214 @@
+import base64
+import io
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+# Add the parent directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import service
+from utils.execution_planner import EXECUTION_MODE_ENV
+
+
+def _workbook_bytes():
+    sheet = pd.DataFrame({
+        "Building": ["B1", "B1", "B2"],
+        "Floor": ["F1", "F2", "F1"],
+        "Sublocation": ["Room A", "Room B", "Room C"],
+    })
+    buffer = io.BytesIO()
+    sheet.to_excel(buffer, sheet_name="Asset,location", index=False)
+    return buffer.getvalue()
+
+
+def _stub_job(processor, files, options):
+    """Stand-in for run_job that sleeps, then optionally kills its worker"""
+    started = time.time()
+    time.sleep(options.get("sleep", 0))
+    if options.get("crash"):
+        os._exit(1)
+    return {
+        "csv": "",
+        "rows": 0,
+        "warnings": None,
+        "validation_report": None,
+        "worker_pid": os.getpid(),
+        "started_at": started,
+        "run_ms": 0.0,
+    }
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "condition not reached in time"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def make_service():
+    services = []
+
+    def make(job_timeout=30):
+        onboarding_service = service.OnboardingService(workers=1, queue_size=0, job_timeout=job_timeout)
+        onboarding_service.warm_up()
+        services.append(onboarding_service)
+        return onboarding_service
+
+    yield make
+    for onboarding_service in services:
+        onboarding_service.shutdown()
+
+
+@pytest.fixture
+def stub_jobs(monkeypatch):
+    monkeypatch.setattr(service, "run_job", _stub_job)
+
+
+def _submit_in_background(onboarding_service, options):
+    responses = []
+    thread = threading.Thread(
+        target=lambda: responses.append(
+            onboarding_service.submit("location", {"workbook": b""}, {"namespace": "ns", **options})
+        )
+    )
+    thread.start()
+    _wait_for(lambda: onboarding_service.health()["in_flight"] == 1)
+    return thread, responses
+
+
+def test_round_trip(make_service):
+    onboarding_service = make_service()
+    status, payload = onboarding_service.submit(
+        "location", {"workbook": _workbook_bytes()}, {"namespace": "ns"}
+    )
+    assert status == 200
+    assert payload["rows"] == 3
+    output = pd.read_csv(io.StringIO(payload["csv"]))
+    assert output["name*"].tolist() == ["F1", "F2", "F1"]
+    assert payload["metrics"]["output_rows"] == 3
+    assert onboarding_service.health()["in_flight"] == 0
+    assert onboarding_service.metrics()["succeeded"] == 1
+
+
+def test_submit_validates_request(make_service):
+    onboarding_service = make_service()
+    assert onboarding_service.submit("unknown", {}, {})[0] == 404
+    assert onboarding_service.submit("location", {}, {"namespace": "ns"})[0] == 400
+    assert onboarding_service.submit("location", {"workbook": b""}, {})[0] == 400
+
+
+def test_full_queue_rejects_jobs(make_service, stub_jobs):
+    onboarding_service = make_service()
+    thread, responses = _submit_in_background(onboarding_service, {"sleep": 1})
+
+    status, _ = onboarding_service.submit("location", {"workbook": b""}, {"namespace": "ns"})
+    assert status == 503
+    assert onboarding_service.metrics()["rejected"] == 1
+
+    thread.join()
+    assert responses[0][0] == 200
+    assert onboarding_service.health()["in_flight"] == 0
+    assert onboarding_service.submit("location", {"workbook": b""}, {"namespace": "ns"})[0] == 200
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes(make_service, stub_jobs):
+    onboarding_service = make_service(job_timeout=0.2)
+    status, _ = onboarding_service.submit(
+        "location", {"workbook": b""}, {"namespace": "ns", "sleep": 1}
+    )
+    assert status == 504
+
+    # The worker is still running the job, so its slot is still taken
+    assert onboarding_service.health()["in_flight"] == 1
+    assert onboarding_service.submit("location", {"workbook": b""}, {"namespace": "ns"})[0] == 503
+
+    _wait_for(lambda: onboarding_service.health()["in_flight"] == 0)
+    assert onboarding_service.submit("location", {"workbook": b""}, {"namespace": "ns"})[0] == 200
+
+
+def test_pool_restarts_after_worker_dies(make_service, stub_jobs):
+    onboarding_service = make_service()
+    status, payload = onboarding_service.submit(
+        "location", {"workbook": b""}, {"namespace": "ns", "crash": True}
+    )
+    assert status == 500
+    assert "pool restarted" in payload["error"]
+
+    _wait_for(lambda: onboarding_service.health()["in_flight"] == 0)
+    assert onboarding_service.submit("location", {"workbook": b""}, {"namespace": "ns"})[0] == 200
+
+
+def test_probe(make_service):
+    onboarding_service = make_service()
+    status, payload = onboarding_service.probe({"workbook": _workbook_bytes()}, ["location", "space"])
+    assert status == 200
+    assert payload == {"ok": True, "problems": {"location": [], "space": []}}
+
+    status, payload = onboarding_service.probe({"workbook": b"not a workbook"}, ["location"])
+    assert status == 200
+    assert not payload["ok"]
+    assert "not a readable .xlsx workbook" in payload["problems"]["location"][0]
+
+    assert onboarding_service.probe({}, None)[0] == 400
+    assert onboarding_service.probe({"workbook": b""}, ["unknown"])[0] == 400
+
+
+def test_probe_takes_a_job_slot(make_service, stub_jobs):
+    onboarding_service = make_service()
+    thread, _ = _submit_in_background(onboarding_service, {"sleep": 1})
+    assert onboarding_service.probe({"workbook": _workbook_bytes()}, ["location"])[0] == 503
+    thread.join()
+    assert onboarding_service.probe({"workbook": _workbook_bytes()}, ["location"])[0] == 200
+
+
+def test_probe_over_http(make_service, monkeypatch):
+    monkeypatch.setattr(service.OnboardingRequestHandler, "service", make_service())
+    server = ThreadingHTTPServer(("127.0.0.1", 0), service.OnboardingRequestHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        body = json.dumps({"files": {"workbook": base64.b64encode(_workbook_bytes()).decode()}})
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_address[1]}/probe", data=body.encode(), method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            payload = json.loads(response.read())
+        assert response.status == 200
+        assert payload["problems"]["location"] == []
+        assert payload["problems"]["facility"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@pytest.mark.parametrize("options, env", [
+    ({"execution_mode": "parallel"}, None),
+    ({"execution_mode": "auto"}, "parallel"),
+    ({}, "Parallel"),
+])
+def test_run_job_never_runs_parallel(monkeypatch, options, env):
+    if env is None:
+        monkeypatch.delenv(EXECUTION_MODE_ENV, raising=False)
+    else:
+        monkeypatch.setenv(EXECUTION_MODE_ENV, env)
+    calls = []
+
+    def record(workbook, template_path, namespace, execution_mode):
+        calls.append(execution_mode)
+        return pd.DataFrame()
+
+    monkeypatch.setitem(service._PROCESSOR_FUNCS, "location", record)
+    service.run_job("location", {"workbook": b""}, {"namespace": "ns", **options})
+    assert calls == ["chunked"]
@@ -0,0 +1,117 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the parent directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from processors.equipment_processor import process_equipment_data
+from processors.facility_processor import process_facility_data
+from processors.location_processor import process_location_data
+from processors.space_processor import process_space_data
+from utils.helpers import get_template_path
+from utils.template_registry import assemble_output, get_template_schema, parse_template
+
+# Rows exported for the workbook fixture before the template registry existed
+EXPECTED_ROWS = {
+    "facility": [
+        ",,ns,,Tower,,C1,,,,Office,,,,,,55.2,25.0,,True",
+    ],
+    "location": [
+        ",,ns,,,Tower,G,,,,,,True",
+        ",,ns,,,Tower,1,,,,,,True",
+        ",,ns,,,Annex,1,,,,,,True",
+    ],
+    "space": [
+        ",,ns,,Tower,,G,Lobby,,,,,,True",
+        ",,ns,,Tower,,1,Room 1,,,,,,True",
+    ],
+    "equipment": [
+        ",,ns,,,,,Chiller,,C1,,,,True,,,,,,,,,,,,101.0,Chiller,HVAC,Lobby",
+        ",,ns,,,,,Plumbing,,C2,,,,True,,,,,,,,,,,,102.0,,Plumbing,Room 1",
+        ",,ns,,,,,Pump,,,,,,True,,,,,,,,,,,,103.0,Pump,Fire,",
+    ],
+}
+EXTRA_COLUMNS = {"equipment": ["barcode", "type", "class", "space name"]}
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    asset_location = pd.DataFrame({
+        "Barcode": [101, 102, 103, 104],
+        "Building": ["Tower", "Tower", "Annex", "Mandatory"],
+        "Floor": ["G", 1, 1, "Mandatory"],
+        "Sublocation": ["Lobby", "Room 1", None, "Mandatory"],
+        "Asset System": ["HVAC", "Plumbing", "Fire", "Mandatory"],
+        "Asset / Equipment": ["Chiller", None, "Pump", "Mandatory"],
+        "Asset Criticality": ["C1", "C2", None, "Mandatory"],
+    })
+    facility = pd.DataFrame({
+        "Building Name": ["Tower", "Annex"],
+        "Facility Type": ["Office", "Mall"],
+        "Building Criticality": ["C1 - High", None],
+        "Longitude": [55.2, None],
+        "Latitude": [25, 26],
+    })
+    path = tmp_path / "workbook.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        asset_location.to_excel(writer, sheet_name="Asset,location", index=False)
+        facility.to_excel(writer, sheet_name="Building (Facility)", index=False)
+    return str(path)
+
+
+def _run(processor, workbook):
+    template = get_template_path(f"{processor}_template.csv")
+    func = {
+        "facility": process_facility_data,
+        "location": process_location_data,
+        "space": process_space_data,
+        "equipment": process_equipment_data,
+    }[processor]
+    result = func(workbook, template, "ns")
+    return result[0] if isinstance(result, tuple) else result
+
+
+@pytest.mark.parametrize("processor", ["facility", "location", "space", "equipment"])
+def test_processor_csv_matches_template_layout(workbook, processor):
+    with open(get_template_path(f"{processor}_template.csv")) as template:
+        header = template.readline().strip().split(",")
+    expected = [",".join(header + EXTRA_COLUMNS.get(processor, [])), *EXPECTED_ROWS[processor]]
+    assert _run(processor, workbook).to_csv(index=False).splitlines() == expected
+
+
+def test_parse_template():
+    schema = parse_template(get_template_path("location_template.csv"))
+    assert schema.columns[:3] == ("id", "minRef", "namespace*")
+    assert schema.columns[-1] == "isActive*"
+    assert schema.dtypes["isActive*"] == bool
+    assert schema.dtypes["id"] == np.float64
+    assert get_template_schema(get_template_path("location_template.csv")) == schema
+
+
+def test_assemble_output_layout():
+    schema = parse_template(get_template_path("location_template.csv"))
+    output = assemble_output(schema, {
+        "barcode": pd.Series([7, 8], index=[5, 9]),
+        "name*": pd.Series(["G", 1], index=[5, 9]),
+        "namespace*": "ns",
+    }, 2)
+    assert list(output.columns) == [*schema.columns, "barcode"]
+    assert output["id"].isna().all()
+    assert output["name*"].tolist() == ["G", 1]
+    assert output["namespace*"].tolist() == ["ns", "ns"]
+    # A template concat pads extra columns with NaN, so integers become floats
+    assert output["barcode"].tolist() == [7.0, 8.0]
+
+
+def test_assemble_output_keeps_missing_values_in_typed_columns():
+    schema = parse_template(get_template_path("location_template.csv"))
+    output = assemble_output(schema, {"isActive*": pd.Series([True, np.nan, False])}, 3)
+    assert output["isActive*"].tolist()[0] is True
+    assert pd.isna(output["isActive*"].tolist()[1])
+    assert output["isActive*"].tolist()[2] is False
@@ -0,0 +1,36 @@
+import json
+import os
+import sys
+
+import pandas as pd
+
+# Add the parent directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from utils.validation_report import ValidationReport, compress_row_ranges, find_non_standard_values
+
+
+def _report():
+    values = pd.Series(["Pump", "Odd", "Odd", "Odd", "Mandatory", None, "Odd"], index=range(7))
+    issues = find_non_standard_values(values, {"pump"}, "Equipment type", "Asset / Equipment")
+    return ValidationReport(issues, title="Warnings:")
+
+
+def test_compress_row_ranges():
+    assert compress_row_ranges([2, 3, 4, 9, 11, 12]) == "2-4, 9, 11-12"
+    assert compress_row_ranges([]) == ""
+
+
+def test_summary_lists_each_value_once():
+    summary = _report().summary()
+    assert summary[["value", "count", "rows"]].values.tolist() == [["Odd", 4, "3-5, 8"]]
+
+
+def test_json_exports_structured_row_ranges():
+    exported = json.loads(_report().to_json())
+    assert exported["total_rows"] == 4
+    assert exported["issues"][0]["rows"] == [[3, 5], [8, 8]]
+    detailed = json.loads(_report().to_json(detailed=True))
+    assert [issue["row"] for issue in detailed["issues"]] == [3, 4, 5, 8]
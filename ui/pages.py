@@ -9,18 +9,21 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-from processors.asset_id_processor import generate_asset_ids
+from processors.asset_id_processor import process_asset_id_file
 from processors.facility_processor import process_facility_data
 from processors.location_processor import process_location_data
 from processors.space_processor import process_space_data
 from processors.equipment_processor import process_equipment_data
 from processors.system_asset_processor import process_system_asset_mapping
 from utils.error_handler import logger
+from utils.helpers import get_template_path
 
-def get_template_path(template_name):
-    """Get the absolute path to a template file"""
-    template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
-    return os.path.join(template_dir, template_name)
+# Warning log format -> (ValidationReport export method, file name, mime type)
+WARNING_LOG_FORMATS = {
+    "Text": ("to_text", "equipment_validation_warnings.txt", "text/plain"),
+    "CSV": ("to_csv", "equipment_validation_warnings.csv", "text/csv"),
+    "JSON": ("to_json", "equipment_validation_warnings.json", "application/json"),
+}
 
 def show_preview_table(df, title="Preview"):
     """Show a preview of the DataFrame with styling"""
@@ -33,7 +36,17 @@ def show_preview_table(df, title="Preview"):
         ) for col in df.columns}
     )
 
-def render_asset_id_page():
+def get_cached_result(cache_name, key, compute):
+    """Reuse a processed result across reruns of the page for the same inputs"""
+    cached = st.session_state.get(cache_name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    result = compute()
+    if result is not None:
+        st.session_state[cache_name] = (key, result)
+    return result
+
+def render_asset_id_page(execution_mode=None):
     st.header("Asset ID Generator")
     uploaded_file = st.file_uploader("Upload an Excel file", type=["xlsx"])
     
@@ -42,8 +55,7 @@ def render_asset_id_page():
         
         if st.button("Process File"):
             try:
-                df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
-                result = generate_asset_ids(df)
+                result = process_asset_id_file(uploaded_file, sheet_name, execution_mode)
                 
                 if result is not None:
                     show_preview_table(result, "Generated Asset IDs")
@@ -63,7 +75,7 @@ def render_asset_id_page():
                 logger.error(f"Error processing file: {str(e)}")
                 st.error(f"Error processing file: {str(e)}")
 
-def render_facility_page(namespace):
+def render_facility_page(namespace, execution_mode=None):
     st.header("Facility Processing")
     
     # Upload facility file
@@ -75,7 +87,7 @@ def render_facility_page(namespace):
         
         if namespace:
             # Process the data
-            result_df = process_facility_data(facility_file, template_path, namespace)
+            result_df = process_facility_data(facility_file, template_path, namespace, execution_mode)
             
             if result_df is not None:
                 # Show preview
@@ -91,7 +103,7 @@ def render_facility_page(namespace):
                     mime="text/csv"
                 )
 
-def render_location_page(namespace):
+def render_location_page(namespace, execution_mode=None):
     st.header("Location Processing")
     
     location_file = st.file_uploader("Upload Location File (Excel)", type=['xlsx'])
@@ -100,7 +112,7 @@ def render_location_page(namespace):
         template_path = get_template_path('location_template.csv')
         
         if namespace:
-            result_df = process_location_data(location_file, template_path, namespace)
+            result_df = process_location_data(location_file, template_path, namespace, execution_mode)
             
             if result_df is not None:
                 show_preview_table(result_df, "Processed Location Data")
@@ -114,7 +126,7 @@ def render_location_page(namespace):
                     mime="text/csv"
                 )
 
-def render_space_page(namespace):
+def render_space_page(namespace, execution_mode=None):
     st.header("Space Processing")
     
     space_file = st.file_uploader("Upload Space File (Excel)", type=['xlsx'])
@@ -123,7 +135,7 @@ def render_space_page(namespace):
         template_path = get_template_path('space_template.csv')
         
         if namespace:
-            result_df = process_space_data(space_file, template_path, namespace)
+            result_df = process_space_data(space_file, template_path, namespace, execution_mode)
             
             if result_df is not None:
                 show_preview_table(result_df, "Processed Space Data")
@@ -137,7 +149,7 @@ def render_space_page(namespace):
                     mime="text/csv"
                 )
 
-def render_equipment_page(namespace):
+def render_equipment_page(namespace, execution_mode=None):
     st.header("Equipment Processing")
     
     equipment_file = st.file_uploader("Upload Equipment File (Excel)", type=['xlsx'])
@@ -146,18 +158,28 @@ def render_equipment_page(namespace):
         template_path = get_template_path('equipment_template.csv')
         
         if namespace:
-            result = process_equipment_data(equipment_file, template_path, namespace)
+            # Any widget change reruns the page, so only reprocess when the inputs change
+            result = get_cached_result(
+                "equipment_result",
+                (equipment_file.file_id, namespace, execution_mode),
+                lambda: process_equipment_data(equipment_file, template_path, namespace, execution_mode)
+            )
             
             if isinstance(result, tuple):
-                result_df, warning_file = result
+                result_df, validation_report = result
                 
-                if warning_file:
+                if validation_report:
                     st.warning("Found non-standard equipment types/classes. You can proceed, but please review the warning log.")
+                    show_preview_table(validation_report.summary(), "Non-standard Equipment Values")
+                    
+                    log_format = st.selectbox("Warning Log Format", list(WARNING_LOG_FORMATS))
+                    detailed = st.checkbox("Include every affected row", value=False)
+                    export_method, file_name, mime = WARNING_LOG_FORMATS[log_format]
                     st.download_button(
                         label="Download Warning Log",
-                        data=warning_file.getvalue(),
-                        file_name="equipment_validation_warnings.txt",
-                        mime="text/plain"
+                        data=getattr(validation_report, export_method)(detailed=detailed),
+                        file_name=file_name,
+                        mime=mime
                     )
                 
                 show_preview_table(result_df, "Processed Equipment Data")
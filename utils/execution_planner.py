@@ -0,0 +1,342 @@
+"""Execution planning for the workbook processing stages"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas._libs.parsers import STR_NA_VALUES
+from pandas.api.types import is_numeric_dtype
+from pandas.io.parsers import TextParser
+
+from utils.error_handler import logger
+
+EAGER = "eager"
+CHUNKED = "chunked"
+PARALLEL = "parallel"
+EXECUTION_MODES = (EAGER, CHUNKED, PARALLEL)
+
+# Forces an execution mode for every stage when set (e.g. "chunked")
+EXECUTION_MODE_ENV = "FACILITROL_EXECUTION_MODE"
+
+DEFAULT_CHUNK_SIZE = 20_000
+# Rough in-memory cost of one cell once loaded into a DataFrame
+BYTES_PER_CELL = 200
+# Share of the available memory a single eager load is allowed to take
+MEMORY_HEADROOM = 0.5
+# Strings pd.read_excel reads as booleans in an all-boolean column
+BOOL_STRINGS = frozenset({"True", "TRUE", "true", "False", "FALSE", "false"})
+
+
+@dataclass
+class ExecutionPlan:
+    """Execution strategy chosen for one sheet"""
+    mode: str
+    rows: int
+    columns: int
+    file_size: int
+    available_memory: Optional[int]
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    workers: int = 1
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def get_file_size(source):
+    """Get the size in bytes of a path or an uploaded file object"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if getattr(source, "size", None) is not None:
+        return source.size
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def get_available_memory():
+    """Get the available physical memory in bytes, or None if unknown"""
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def inspect_sheet(source, sheet_name):
+    """Get the (rows, columns) dimensions of a sheet without loading it"""
+    _rewind(source)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name]
+        if worksheet.max_row is None or worksheet.max_column is None:
+            worksheet.calculate_dimension(force=True)
+        return worksheet.max_row or 0, worksheet.max_column or 0
+    finally:
+        workbook.close()
+        _rewind(source)
+
+
+def resolve_execution_mode(override=None):
+    """Get the requested execution mode from the argument or the environment
+
+    "auto" (any case) or no override defers to the environment variable, and
+    None means the planner decides.
+    """
+    mode = (override or "").lower().strip()
+    if mode in ("", "auto"):
+        mode = os.environ.get(EXECUTION_MODE_ENV, "").lower().strip()
+    if mode in ("", "auto"):
+        return None
+    if mode not in EXECUTION_MODES:
+        raise ValueError(
+            f"Unknown execution mode '{mode}', expected one of: {', '.join(EXECUTION_MODES)}"
+        )
+    return mode
+
+
+def plan_execution(source, sheet_name, override=None, chunk_size=None):
+    """Choose eager, chunked or parallel execution for a sheet
+
+    The sheet is parsed serially in every mode and the parse dominates the
+    cost of every stage's transform, so automatic planning only picks eager
+    or chunked. Parallel execution has to be requested explicitly.
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    rows, columns = inspect_sheet(source, sheet_name)
+    file_size = get_file_size(source)
+    available_memory = get_available_memory()
+    workers = max(1, min(os.cpu_count() or 1, -(-rows // chunk_size)))
+
+    mode = resolve_execution_mode(override)
+    reason = "override"
+    if mode is None:
+        estimated_memory = rows * columns * BYTES_PER_CELL
+        if available_memory is not None and estimated_memory > available_memory * MEMORY_HEADROOM:
+            mode, reason = CHUNKED, "estimated size exceeds available memory"
+        else:
+            mode, reason = EAGER, "fits in memory"
+
+    plan = ExecutionPlan(
+        mode=mode,
+        rows=rows,
+        columns=columns,
+        file_size=file_size,
+        available_memory=available_memory,
+        chunk_size=chunk_size,
+        workers=workers if mode == PARALLEL else 1,
+    )
+    logger.info(
+        f"Execution plan for '{sheet_name}': {plan.mode} ({reason}; rows={rows}, "
+        f"columns={columns}, file_size={file_size}, available_memory={available_memory}, "
+        f"workers={plan.workers})"
+    )
+    return plan
+
+
+def get_header_names(header_row):
+    """Name header cells the same way pd.read_excel does"""
+    names = []
+    seen = {}
+    for idx, value in enumerate(header_row):
+        name = f"Unnamed: {idx}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _parse_rows(header_row, rows):
+    """Parse raw sheet rows with the parser and type inference pd.read_excel uses"""
+    return TextParser([header_row, *rows], header=0, skip_blank_lines=False).read()
+
+
+def _value_kinds(values):
+    """Classify raw cell values by how pd.read_excel's type inference treats them"""
+    values = pd.Series(values, dtype=object)
+    kinds = values.map(lambda value: type(value).__name__).to_numpy(dtype=object)
+    is_text = kinds == "str"
+    if is_text.any():
+        text = values[is_text]
+        kinds[is_text] = np.select(
+            [
+                text.isin(STR_NA_VALUES),
+                text.isin(BOOL_STRINGS),
+                pd.to_numeric(text, errors="coerce").isna(),
+                text.str.fullmatch(r"\s*[-+]?\d+\s*"),
+            ],
+            ["missing", "bool text", "text", "int text"],
+            "float text",
+        )
+    kinds[values.isna().to_numpy()] = "missing"
+    return kinds
+
+
+def _convert_value(value):
+    """Convert a cell value the way pd.read_excel's openpyxl reader does"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return np.nan
+    return value
+
+
+def _convert_row(row):
+    values = [_convert_value(value) for value in row]
+    # Trailing empty cells are trimmed, so blank rows become empty lists
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+def _iter_raw_chunks(source, sheet_name, chunk_size):
+    """Stream the header row and (start, rows) chunks of converted cell values
+
+    Rows keep their own length; trailing blank rows are dropped, like
+    pd.read_excel does.
+    """
+    _rewind(source)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        yield _convert_row(next(rows, ()))
+
+        chunk = []
+        pending_blank = []
+        start = 0
+        yielded = False
+        for row in rows:
+            row = _convert_row(row)
+            if not row:
+                pending_blank.append(row)
+                continue
+            chunk.extend(pending_blank)
+            pending_blank = []
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield start, chunk
+                yielded = True
+                start += len(chunk)
+                chunk = []
+
+        # Always yield at least one (possibly empty) chunk
+        if chunk or not yielded:
+            yield start, chunk
+    finally:
+        workbook.close()
+        _rewind(source)
+
+
+def _pad(row, width):
+    return row + [""] * (width - len(row))
+
+
+def get_sheet_layout(source, sheet_name, chunk_size=None):
+    """Get the width and the per-column dtypes pd.read_excel would give a sheet
+
+    The inference only depends on which kinds of values a column holds and
+    which kind comes first, so one sample value per kind, in order of first
+    appearance, is parsed in place of the whole column.
+    """
+    chunks = _iter_raw_chunks(source, sheet_name, chunk_size or DEFAULT_CHUNK_SIZE)
+    header_row = next(chunks)
+    samples = [{} for _ in header_row]
+    for start, rows in chunks:
+        width = max(map(len, rows), default=0)
+        # Columns first seen here were blank (padded) in every earlier row
+        samples.extend({"missing": ""} if start else {} for _ in range(width - len(samples)))
+        for idx, values in enumerate(zip(*(_pad(row, len(samples)) for row in rows))):
+            kinds = _value_kinds(values)
+            _, first = np.unique(kinds, return_index=True)
+            for position in sorted(first):
+                samples[idx].setdefault(kinds[position], values[position])
+
+    header_row = _pad(header_row, len(samples))
+    dtypes = [
+        _parse_rows([name], [[value] for value in sample.values()]).iloc[:, 0].dtype
+        for name, sample in zip(header_row, samples)
+    ]
+    return len(samples), dtypes
+
+
+def _to_frame(header_row, rows, start, dtypes):
+    """Build a chunk DataFrame with the whole sheet's column dtypes"""
+    parsed = _parse_rows(header_row, rows)
+    parsed.index = range(start, start + len(rows))
+    raw = pd.DataFrame(rows, columns=parsed.columns, index=parsed.index, dtype=object)
+    for idx, dtype in enumerate(dtypes):
+        if is_numeric_dtype(dtype):
+            # Numeric and boolean columns convert value by value, like the parser
+            column = parsed.iloc[:, idx].astype(dtype)
+        else:
+            # Other columns keep their raw values, with NA strings read as missing
+            column = raw.iloc[:, idx]
+            column = column.where(column.notna() & ~column.isin(STR_NA_VALUES))
+            if dtype != object:
+                column = column.astype(dtype)
+        parsed[parsed.columns[idx]] = column
+    return parsed
+
+
+def iter_sheet_chunks(source, sheet_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream a sheet as DataFrames of at most chunk_size rows
+
+    Chunks are indexed by data row position and typed per whole column,
+    matching pd.read_excel. Column types need a first pass over the sheet,
+    so the sheet is read twice.
+    """
+    width, dtypes = get_sheet_layout(source, sheet_name, chunk_size)
+    chunks = _iter_raw_chunks(source, sheet_name, chunk_size)
+    header_row = _pad(next(chunks), width)
+    for start, rows in chunks:
+        yield _to_frame(header_row, [_pad(row, width) for row in rows], start, dtypes)
+
+
+def select_unique_rows(df, columns):
+    """Get the distinct combinations of the given columns"""
+    return df[columns].drop_duplicates()
+
+
+def run_stage(source, sheet_name, transform, plan):
+    """Apply a row-wise transform to a sheet following the execution plan
+
+    The transform must be a picklable callable taking and returning a
+    DataFrame. Chunked and parallel results are concatenated in sheet order
+    and keep their sheet row index. Parallel runs keep at most two chunks
+    per worker in flight so memory stays bounded.
+    """
+    if plan.mode == EAGER:
+        _rewind(source)
+        return transform(pd.read_excel(source, sheet_name=sheet_name))
+
+    chunks = iter_sheet_chunks(source, sheet_name, plan.chunk_size)
+    if plan.mode == PARALLEL:
+        parts = []
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=plan.workers) as executor:
+            for chunk in chunks:
+                if len(pending) >= plan.workers * 2:
+                    parts.append(pending.popleft().result())
+                pending.append(executor.submit(transform, chunk))
+            parts.extend(future.result() for future in pending)
+    else:
+        parts = [transform(chunk) for chunk in chunks]
+    return pd.concat(parts)
@@ -1,5 +1,12 @@
+import os
 import pandas as pd
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+def get_template_path(template_name):
+    """Get the absolute path to a template file"""
+    return os.path.join(TEMPLATE_DIR, template_name)
+
 def get_short_form(text):
     """Get short form of text for asset ID generation"""
     if pd.isna(text) or str(text).strip() == "":
@@ -7,6 +14,12 @@ def get_short_form(text):
     text = str(text).strip()
     return text[:3].upper() if len(text) >= 3 else text.upper()
 
+def get_short_forms(values):
+    """Get the short form of every value in a Series, like get_short_form"""
+    # Object dtype keeps Python's str()/upper() semantics for every value
+    text = values.astype(object).map(str).astype(object).str.strip()
+    return text.str[:3].str.upper().where(values.notna() & (text != ""), "UNK")
+
 def clean_and_truncate_facility_name(name, substrings_to_ignore):
     """Clean and truncate facility names"""
     if isinstance(name, str):
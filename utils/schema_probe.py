@@ -0,0 +1,230 @@
+"""Header-only workbook schema checks that run before any full sheet load
+
+openpyxl loads the whole shared strings table even in read-only mode, so the
+probe reads the xlsx parts directly: the sheet list, then each requested sheet
+only up to its first row, resolving just the shared strings that row uses.
+"""
+import posixpath
+import re
+import zipfile
+from difflib import get_close_matches
+from xml.etree.ElementTree import ParseError, iterparse
+
+from utils.execution_planner import get_header_names
+from utils.validation_constants import PROCESSOR_SCHEMAS
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+class SchemaError(ValueError):
+    """Raised with every schema problem found in a workbook"""
+
+    def __init__(self, problems):
+        # problems is the only argument so the error survives pickling
+        super().__init__(problems)
+        self.problems = problems
+
+    def __str__(self):
+        return "Workbook schema check failed:\n" + "\n".join(f"- {p}" for p in self.problems)
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def _column_index(cell_ref):
+    """Convert a cell reference such as 'AB1' to a zero-based column index"""
+    index = 0
+    for char in re.match(r"[A-Z]+", cell_ref).group():
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index - 1
+
+
+def _read_relationships(archive, rels_path, base_dir):
+    """Map relationship ids to (type, part path) for one .rels part"""
+    relationships = {}
+    with archive.open(rels_path) as rels:
+        for _, element in iterparse(rels):
+            if element.tag == f"{PACKAGE_REL_NS}Relationship":
+                target = element.get("Target")
+                if target.startswith("/"):
+                    target = target[1:]
+                else:
+                    target = posixpath.normpath(posixpath.join(base_dir, target))
+                relationships[element.get("Id")] = (element.get("Type", ""), target)
+    return relationships
+
+
+def _workbook_parts(archive):
+    """Find the sheet part paths, in workbook order, and the shared strings path
+
+    The workbook part is located through the package relationships rather
+    than assumed to be xl/workbook.xml.
+    """
+    package = _read_relationships(archive, "_rels/.rels", "")
+    workbook_path = next(
+        (path for rel_type, path in package.values() if rel_type.endswith("/officeDocument")), None
+    )
+    if workbook_path is None:
+        raise ValueError("no workbook part")
+
+    base_dir, name = posixpath.split(workbook_path)
+    targets = _read_relationships(archive, posixpath.join(base_dir, "_rels", f"{name}.rels"), base_dir)
+    shared_strings = next(
+        (path for rel_type, path in targets.values() if rel_type.endswith("/sharedStrings")), None
+    )
+
+    paths = {}
+    with archive.open(workbook_path) as workbook:
+        for _, element in iterparse(workbook):
+            if element.tag == f"{MAIN_NS}sheet":
+                target = targets.get(element.get(f"{REL_NS}id"))
+                if target is None:
+                    raise ValueError(f"no part for sheet '{element.get('name')}'")
+                paths[element.get("name")] = target[1]
+    return paths, shared_strings
+
+
+def _read_first_row(archive, path):
+    """Get (column index, cell type, raw value) for the cells of row 1"""
+    cells = []
+    with archive.open(path) as sheet:
+        for _, element in iterparse(sheet):
+            if element.tag == f"{MAIN_NS}c":
+                if element.get("t") == "inlineStr":
+                    value = "".join(t.text or "" for t in element.iter(f"{MAIN_NS}t"))
+                else:
+                    value = element.findtext(f"{MAIN_NS}v")
+                ref = element.get("r")
+                cells.append((_column_index(ref) if ref else len(cells), element.get("t"), value))
+            elif element.tag == f"{MAIN_NS}row":
+                # The header is row 1; a blank row 1 is simply absent from the XML
+                if element.get("r", "1") != "1":
+                    cells = []
+                break
+    return cells
+
+
+def _read_shared_strings(archive, path, indices):
+    """Resolve only the requested shared string indices"""
+    if not indices or path is None:
+        return {}
+    strings = {}
+    last = max(indices)
+    position = 0
+    with archive.open(path) as shared:
+        for _, element in iterparse(shared):
+            if element.tag == f"{MAIN_NS}si":
+                if position in indices:
+                    # Phonetic runs (rPh) are not part of the displayed text
+                    phonetic = {id(t) for r in element.iter(f"{MAIN_NS}rPh") for t in r.iter(f"{MAIN_NS}t")}
+                    strings[position] = "".join(
+                        t.text or "" for t in element.iter(f"{MAIN_NS}t") if id(t) not in phonetic
+                    )
+                if position == last:
+                    break
+                position += 1
+                element.clear()
+    return strings
+
+
+def _convert_header_value(cell_type, value, shared_strings):
+    if value is None:
+        return None
+    if cell_type == "s":
+        return shared_strings.get(int(value))
+    if cell_type in ("str", "inlineStr", "e"):
+        return value
+    if cell_type == "b":
+        return value == "1"
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def read_sheet_headers(source, sheet_names=None):
+    """Get the sheet names and header rows of a workbook without parsing its data
+
+    Returns a dict of sheet name -> header names for the requested sheets
+    that exist (all sheets when sheet_names is None), plus the list of every
+    sheet name in the workbook.
+    """
+    _rewind(source)
+    try:
+        with zipfile.ZipFile(source) as archive:
+            paths, shared_strings_path = _workbook_parts(archive)
+            wanted = list(paths) if sheet_names is None else [s for s in sheet_names if s in paths]
+
+            rows = {sheet: _read_first_row(archive, paths[sheet]) for sheet in wanted}
+            indices = {int(value) for cells in rows.values() for _, t, value in cells if t == "s"}
+            shared_strings = _read_shared_strings(archive, shared_strings_path, indices)
+    finally:
+        _rewind(source)
+
+    headers = {}
+    for sheet, cells in rows.items():
+        width = max((idx for idx, _, _ in cells), default=-1) + 1
+        row = [None] * width
+        for idx, cell_type, value in cells:
+            row[idx] = _convert_header_value(cell_type, value, shared_strings)
+        headers[sheet] = get_header_names(row)
+    return headers, list(paths)
+
+
+def _find_problems(headers, sheet_names, schemas):
+    problems = []
+    for sheet, columns in schemas.items():
+        if sheet not in headers:
+            problems.append(f"Missing sheet '{sheet}' (found: {', '.join(sheet_names)})")
+            continue
+        present = [str(name) for name in headers[sheet]]
+        for column in columns:
+            if column in headers[sheet]:
+                continue
+            problem = f"Sheet '{sheet}' is missing column '{column}'"
+            suggestions = get_close_matches(column, present, n=1, cutoff=0.8)
+            if suggestions:
+                problem += f" (did you mean '{suggestions[0]}'?)"
+            problems.append(problem)
+    return problems
+
+
+def _read_headers_or_problem(source, sheet_names):
+    try:
+        return read_sheet_headers(source, sheet_names), None
+    except (zipfile.BadZipFile, KeyError, ParseError, ValueError) as e:
+        return (None, None), f"File is not a readable .xlsx workbook ({str(e)})"
+
+
+def probe_schema(source, schemas):
+    """List every missing sheet and column for a {sheet: columns} schema"""
+    (headers, sheet_names), problem = _read_headers_or_problem(source, list(schemas))
+    if problem:
+        return [problem]
+    return _find_problems(headers, sheet_names, schemas)
+
+
+def check_schema(source, schemas):
+    """Raise SchemaError listing all problems if the workbook does not match"""
+    problems = probe_schema(source, schemas)
+    if problems:
+        raise SchemaError(problems)
+
+
+def probe_workbook(source, processors=None):
+    """Check a workbook against every processor's schema at once
+
+    Returns a dict of processor name -> list of problems (empty when the
+    workbook can be processed).
+    """
+    processors = processors or list(PROCESSOR_SCHEMAS)
+    wanted = {sheet for processor in processors for sheet in PROCESSOR_SCHEMAS[processor]}
+    (headers, sheet_names), problem = _read_headers_or_problem(source, sorted(wanted))
+    if problem:
+        return {processor: [problem] for processor in processors}
+    return {
+        processor: _find_problems(headers, sheet_names, PROCESSOR_SCHEMAS[processor])
+        for processor in processors
+    }
@@ -0,0 +1,77 @@
+"""Template column schemas, parsed once and used to assemble processor outputs"""
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from pandas.core.dtypes.cast import ensure_dtype_can_hold_na, find_common_type
+
+from utils.helpers import TEMPLATE_DIR
+
+
+@dataclass(frozen=True)
+class TemplateSchema:
+    """Column order and dtypes of an upload template
+
+    Dtypes are read from the placeholder rows, so blank columns are float64.
+    """
+    columns: tuple
+    dtypes: dict
+
+
+def parse_template(template_file):
+    """Parse a template CSV into its column schema"""
+    # Templates only hold placeholder rows, which are used to infer dtypes
+    placeholder = pd.read_csv(template_file)
+    return TemplateSchema(columns=tuple(placeholder.columns), dtypes=placeholder.dtypes.to_dict())
+
+
+def _load_registry():
+    return {
+        os.path.join(TEMPLATE_DIR, name): parse_template(os.path.join(TEMPLATE_DIR, name))
+        for name in sorted(os.listdir(TEMPLATE_DIR))
+        if name.endswith(".csv")
+    }
+
+
+# Every bundled template, keyed by absolute path and parsed at import
+TEMPLATE_SCHEMAS = _load_registry()
+
+
+def get_template_schema(template_file):
+    """Get the schema of a template path or file object"""
+    if isinstance(template_file, (str, os.PathLike)):
+        path = os.path.abspath(template_file)
+        if path not in TEMPLATE_SCHEMAS:
+            TEMPLATE_SCHEMAS[path] = parse_template(path)
+        return TEMPLATE_SCHEMAS[path]
+    return parse_template(template_file)
+
+
+def assemble_output(schema, data, length):
+    """Build an output frame in template column order without a template concat
+
+    data maps column names to Series or scalars. Template columns missing
+    from data are left blank, and columns not in the template follow the
+    template columns in the order given. Series get the dtype they would have
+    had if appended to the template's (empty) placeholder frame, so exports
+    match a template concat.
+    """
+    columns = {}
+    for col in (*schema.columns, *(col for col in data if col not in schema.dtypes)):
+        if col not in data:
+            columns[col] = np.full(length, np.nan)
+            continue
+        values = data[col]
+        if isinstance(values, pd.Series):
+            if col in schema.dtypes:
+                dtype = find_common_type([schema.dtypes[col], values.dtype])
+            else:
+                # Extra columns are missing from the template, so a concat pads them with NaN
+                dtype = ensure_dtype_can_hold_na(values.dtype)
+            if values.dtype != dtype:
+                values = values.astype(dtype)
+            # Take the underlying array so the Series index is not realigned
+            values = values.array
+        columns[col] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(length), copy=False)
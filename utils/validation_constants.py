@@ -91,3 +91,26 @@ EQUIPMENT_CLASSES = {
     'Mechanical', 'Plumbing', 'Public address system', 'Soft services',
     'Swimming pool'
 }
+
+# Lowercased vocabularies for case-insensitive lookups, built once at import
+NORMALIZED_EQUIPMENT_TYPES = frozenset(t.lower().strip() for t in EQUIPMENT_TYPES)
+NORMALIZED_EQUIPMENT_CLASSES = frozenset(c.lower().strip() for c in EQUIPMENT_CLASSES)
+
+# Source sheets read by the processors
+FACILITY_SHEET = 'Building (Facility)'
+ASSET_LOCATION_SHEET = 'Asset,location'
+
+# Source columns each processor reads, checked before any full sheet load
+FACILITY_COLUMNS = ['Building Name', 'Facility Type', 'Building Criticality', 'Longitude', 'Latitude']
+LOCATION_COLUMNS = ['Building', 'Floor']
+SPACE_COLUMNS = ['Building', 'Floor', 'Sublocation']
+EQUIPMENT_COLUMNS = ['Barcode', 'Asset System', 'Asset / Equipment', 'Asset Criticality', 'Sublocation']
+ASSET_ID_COLUMNS = ['Building', 'Location', 'Space', 'Subspace', 'Asset System', 'Asset / Equipment']
+
+PROCESSOR_SCHEMAS = {
+    'facility': {FACILITY_SHEET: FACILITY_COLUMNS},
+    'location': {ASSET_LOCATION_SHEET: LOCATION_COLUMNS},
+    'space': {ASSET_LOCATION_SHEET: SPACE_COLUMNS},
+    'equipment': {ASSET_LOCATION_SHEET: EQUIPMENT_COLUMNS},
+    'asset_ids': {ASSET_LOCATION_SHEET: ASSET_ID_COLUMNS},
+}
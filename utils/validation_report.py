@@ -0,0 +1,119 @@
+"""Aggregated reports of non-standard values found during validation"""
+import json
+
+import numpy as np
+import pandas as pd
+
+ISSUE_COLUMNS = ["category", "column", "value", "count", "row_numbers"]
+
+
+def get_row_ranges(row_numbers):
+    """Group sorted row numbers into [start, end] runs, e.g. [2, 3, 4, 9] -> [[2, 4], [9, 9]]"""
+    rows = np.asarray(row_numbers, dtype=np.int64)
+    if rows.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(rows) != 1)
+    starts = rows[np.concatenate(([0], breaks + 1))]
+    ends = rows[np.concatenate((breaks, [rows.size - 1]))]
+    return [[start, end] for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+def compress_row_ranges(row_numbers):
+    """Compress sorted row numbers into ranges, e.g. [2, 3, 4, 9] -> '2-4, 9'"""
+    return ", ".join(
+        str(start) if start == end else f"{start}-{end}"
+        for start, end in get_row_ranges(row_numbers)
+    )
+
+
+def find_non_standard_values(values, valid_values, category, column, ignore=("Mandatory",)):
+    """Group the values missing from a case-insensitive vocabulary
+
+    Returns one row per unique value with its count and sheet row numbers
+    (index + 2, accounting for the header row).
+    """
+    values = values[values.notna() & ~values.isin(ignore)]
+    normalized = values.astype(str).str.lower().str.strip()
+    invalid = values[~normalized.isin(valid_values)]
+    if invalid.empty:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+
+    row_numbers = pd.Series(invalid.index + 2, index=invalid.index)
+    grouped = row_numbers.groupby(invalid.values, sort=True).agg(lambda rows: sorted(rows))
+    return pd.DataFrame({
+        "category": category,
+        "column": column,
+        "value": grouped.index,
+        "count": grouped.map(len).to_numpy(),
+        "row_numbers": grouped.to_numpy(),
+    })
+
+
+class ValidationReport:
+    """Non-standard values, listed once per value with counts and row ranges"""
+
+    def __init__(self, issues, title, headings=None, note=None):
+        self.issues = issues.reset_index(drop=True)
+        self.title = title
+        self.headings = headings or {}
+        self.note = note
+
+    def __len__(self):
+        return len(self.issues)
+
+    @property
+    def total_rows(self):
+        return int(self.issues["count"].sum()) if len(self) else 0
+
+    def summary(self):
+        """One row per non-standard value with compressed row ranges"""
+        summary = self.issues.drop(columns="row_numbers")
+        summary["rows"] = self.issues["row_numbers"].map(compress_row_ranges)
+        return summary
+
+    def details(self):
+        """One row per offending sheet row"""
+        details = self.issues.explode("row_numbers").rename(columns={"row_numbers": "row"})
+        order = {category: idx for idx, category in enumerate(self.issues["category"].unique())}
+        details = details.drop(columns="count").sort_values(
+            ["category", "row"],
+            key=lambda col: col.map(order) if col.name == "category" else col,
+            kind="stable",
+        )
+        return details[["row", "category", "column", "value"]].reset_index(drop=True)
+
+    def to_text(self, detailed=False):
+        lines = [self.title, "=" * len(self.title)]
+        if detailed:
+            lines.extend(
+                f"Row {row.row}: Non-standard {row.category.lower()} '{row.value}' in {row.column} column"
+                for row in self.details().itertuples(index=False)
+            )
+        for category, section in self.summary().groupby("category", sort=False):
+            heading = self.headings.get(category, f"Non-standard {category} values found:")
+            lines.extend(["", heading, "=" * len(heading)])
+            lines.extend(
+                f"- {row.value} ({row.count} {'row' if row.count == 1 else 'rows'}: {row.rows})"
+                for row in section.itertuples(index=False)
+            )
+        if self.note:
+            lines.extend(["", self.note])
+        return "\n".join(lines)
+
+    def to_csv(self, detailed=False):
+        frame = self.details() if detailed else self.summary()
+        return frame.to_csv(index=False)
+
+    def to_json(self, detailed=False):
+        if detailed:
+            frame = self.details()
+        else:
+            # Row ranges stay structured here rather than the text/CSV string
+            frame = self.issues.drop(columns="row_numbers")
+            frame["rows"] = self.issues["row_numbers"].map(get_row_ranges)
+        return json.dumps({
+            "title": self.title,
+            "total_rows": self.total_rows,
+            "issues": frame.to_dict(orient="records"),
+            "note": self.note,
+        }, default=str)